@@ -4,12 +4,10 @@
 #                                 LIBRARIES                                    #
 # ============================================================================ #
 import os
-import datetime
-import pandas as pd
-import settings
-import visual
 import calendar
 import numpy as np
+import pandas as pd
+import settings
 
 #%%
 # ============================================================================ #
@@ -170,6 +168,37 @@ def preprocess(df):
     df['region_compliance_pct'] = df['region_compliance'] * 100 / df['region_tickets'] 
 
 
+    #-------------------------------------------------------------------------#
+    # Dates, payment window, judgment amount and coordinates                  #
+    #-------------------------------------------------------------------------#
+    df = transform(df)
+
+
+    #-------------------------------------------------------------------------#
+    # Drop unnecessary variables                                              # 
+    #-------------------------------------------------------------------------#
+    df = df.drop(columns = ['city', 'state', 'zip_code'])
+
+    print(df.info())
+    #print(df.head())
+
+    return(df)
+   
+#%%
+# ============================================================================ #
+#                                 TRANSFORM                                    #
+#    Date, amount and location features that do not depend on compliance,     #
+#    so they can be computed for unlabeled tickets at scoring time.            #
+# ============================================================================ #
+def median_window(df):
+    # Median days from ticket issue to hearing, over tickets with both dates.
+    window = pd.to_datetime(df['hearing_date']) - pd.to_datetime(df['ticket_issued_date'])
+    return((window / np.timedelta64(1, 'D')).median())
+
+def transform(df, median_payment_window = None):
+    # The median payment window is computed from df unless given, so scoring
+    # can impute with the training value rather than that of each batch.
+
     #-------------------------------------------------------------------------#
     # Impute missing hearing dates:ticket_issued_date + median payment_window # 
     #-------------------------------------------------------------------------#
@@ -179,19 +208,22 @@ def preprocess(df):
     df['ticket_issued_date'] = pd.to_datetime(df['ticket_issued_date'])
     df['hearing_date'] = pd.to_datetime(df['hearing_date'])
 
-    # Compute payment window for non-null hearing dates
-    df1 = df[pd.notnull(df['hearing_date'])]    
-    df1['payment_window'] = df1['hearing_date'].sub(df1['ticket_issued_date'], axis=0)
-    median_payment_window = (df1['payment_window'] / np.timedelta64(1, 'D')).median()    
+    if median_payment_window is None:
+        median_payment_window = median_window(df)
 
     # Correct hearing dates on or before ticket_issued_date
-    df['hearing_date'] = np.where(df['hearing_date'] <= df['ticket_issued_date'],
-                                df['hearing_date'] + pd.to_timedelta(median_payment_window,'d'),
-                                df['hearing_date'])
+    median_delta = pd.to_timedelta(median_payment_window, 'D')
+    df['hearing_date'] = df['hearing_date'].mask(
+        df['hearing_date'] <= df['ticket_issued_date'],
+        df['ticket_issued_date'] + median_delta)
+
+    # Compute payment window for non-null hearing dates
+    df1 = df[pd.notnull(df['hearing_date'])]
+    df1['payment_window'] = df1['hearing_date'].sub(df1['ticket_issued_date'], axis=0)
 
     # Impute payment window for null hearing dates
     df2 = df[pd.isnull(df['hearing_date'])]    
-    df2['payment_window'] = pd.to_timedelta(median_payment_window,'d')
+    df2['payment_window'] = median_delta
     df2['hearing_date'] = df2['ticket_issued_date'] + df2['payment_window']
 
     # Recombine observations
@@ -216,10 +248,10 @@ def preprocess(df):
     #-------------------------------------------------------------------------#
     df['ticket_issued_month'] = df.ticket_issued_date.dt.month
     df['ticket_issued_month'] = df['ticket_issued_month'].apply(lambda x: calendar.month_abbr[x])
-    df['ticket_issued_week'] = df.ticket_issued_date.dt.week
+    df['ticket_issued_week'] = df.ticket_issued_date.dt.isocalendar().week
     df['hearing_month'] = df.hearing_date.dt.month
     df['hearing_month'] = df['hearing_month'].apply(lambda x: calendar.month_abbr[x])
-    df['hearing_week'] = df.hearing_date.dt.week
+    df['hearing_week'] = df.hearing_date.dt.isocalendar().week
 
     #-------------------------------------------------------------------------#
     # Convert lat / long to x,y,z coordinates                                 # 
@@ -227,17 +259,8 @@ def preprocess(df):
     df['x'] = np.cos(np.radians(df['lat'])) * np.cos(np.radians(df['lon']))
     df['y'] = np.cos(np.radians(df['lat'])) * np.sin(np.radians(df['lon']))
     df['z'] = np.sin(np.radians(df['lat']))
-
-    #-------------------------------------------------------------------------#
-    # Drop unnecessary variables                                              # 
-    #-------------------------------------------------------------------------#
-    df = df.drop(columns = ['city', 'state', 'zip_code'])
-
-    print(df.info())
-    #print(df.head())
-
     return(df)
-   
+
 #%%    
 # ============================================================================ #
 #                                 Write                                        #
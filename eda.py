@@ -1,158 +1,121 @@
-
 #%%
-# =============================================================================
-import matplotlib.pyplot as plt
-import numpy as np
+# ============================================================================ #
+#                                  LIBRARIES                                   #
+# ============================================================================ #
 import os
 import pandas as pd
-import seaborn as sns
 import settings
 import visual
-import tabulate
-from tabulate import tabulate
+
 #%%
 # ============================================================================ #
 # Read processed training data                                                 #
 # ============================================================================ #
-df = pd.read_csv(os.path.join(settings.PROCESSED_DATA_DIR, "train.csv"), 
-    encoding = "Latin-1", low_memory = False)
-print(df.info())    
+def read(file_name = "train.csv"):
+    df = pd.read_csv(os.path.join(settings.PROCESSED_DATA_DIR, file_name),
+        encoding = "Latin-1", low_memory = False)
+    return(df)
 
 #%%
 # ============================================================================ #
 # Compliance                                                                   #
-# ============================================================================ #   
-compliance = df.copy()
-compliance = df.groupby(['compliance_label'])['violation_code'].count().reset_index()
-compliance.columns = ['Compliance', 'Counts']
-compliance['Percent'] = compliance['Counts'] * 100 / compliance['Counts'].sum()
-sns.set(style="whitegrid")
-sns.barplot(x="Compliance", y="Counts", data=compliance, color='steelblue',
-order = ["Compliant", "Non-Compliant"]).set_title("Complance Summary")    
-visual.print_df(compliance)
+# ============================================================================ #
+def compliance(df):
+    summary = df.groupby(['compliance_label'])['violation_code'].count().reset_index()
+    summary.columns = ['Compliance', 'Counts']
+    summary['Percent'] = summary['Counts'] * 100 / summary['Counts'].sum()
+    return(summary)
 
 #%%
 # ============================================================================ #
 # Agency                                                                       #
 # ============================================================================ #
-visual.print_df(df[["agency_name"]].describe().T)
-agency = df[["agency_name", "agency_compliance_pct"]].copy()
-agency.columns = ['Agency_Name', 'Compliance_Pct']
-sns.set(style="whitegrid")
-sns.barplot(x="Compliance_Pct", y="Agency_Name", data=agency).set_title("Agency Compliance Percent")
+def agency(df):
+    agency = df[["agency_name", "agency_compliance_pct"]].copy()
+    agency.columns = ['Agency_Name', 'Compliance_Pct']
+    return(agency)
 
 #%%
 # ============================================================================ #
-# Inspector                                                                    #
+# Compliance Percent Spectrum                                                  #
+#    Inspector, region and violation code are summarized by the frequency      #
+#    distribution of their compliance percentages. State is dropped by         #
+#    data.preprocess, so its spectrum is taken over the ticket level values.   #
 # ============================================================================ #
-visual.print_df(df[["inspector"]].describe().T)
-city = df[['inspector', 'inspector_compliance_pct']].drop_duplicates()
-city.columns = ['Inspector', 'Compliance_Pct']
-sns.set(style="whitegrid")
-sns.distplot(inspector.Compliance_Pct, kde=False).set_title("Compliance Percent Frequency Spectrum by Inspector")
+def spectrum(df, var, pct_var, label):
+    levels = df[[var, pct_var]].drop_duplicates()
+    levels.columns = [label, 'Compliance_Pct']
+    return(levels)
 
-#%%
-# ============================================================================ #
-# Out of Town                                                                  #
-# ============================================================================ #
-visual.print_df(df[["out_of_town"]].describe().T)
-oot = df[['out_of_town', 'out_of_town_compliance_pct']].drop_duplicates()
-oot.columns = ['Out_of_Town', 'Compliance_Pct']
-sns.set(style="whitegrid")
-sns.barplot(x="Out_of_Town", y="Compliance_Pct", data=oot).set_title("In vs Out of Town Compliance Percent")
+SPECTRUM = [
+    ('inspector_name', 'inspector_compliance_pct', 'Inspector',
+     "Compliance Percent Frequency Spectrum by Inspector"),
+    ('region', 'region_compliance_pct', 'Region',
+     "Compliance Percent Frequency Spectrum by Region"),
+    ('violation_code', 'violation_compliance_pct', 'violation_code',
+     "Compliance Percent Frequency Spectrum by Violation Code")]
 
 #%%
 # ============================================================================ #
-# State                                                                        #
+# Out of Town / Out of State / Ticket Issued Month                             #
 # ============================================================================ #
-visual.print_df(df[["state"]].describe().T)
-state = df[['state', 'state_compliance_pct']].drop_duplicates()
-state.columns = ['State', 'Compliance_Pct']
-sns.set(style="whitegrid")
-sns.distplot(state.Compliance_Pct, kde=False).set_title("Compliance Percent Frequency Spectrum by State")
+def indicator(df, var, label):
+    levels = (df.groupby([var])['compliance'].mean() * 100).reset_index()
+    levels.columns = [label, 'Compliance_Pct']
+    return(levels)
 
-#%%
-# ============================================================================ #
-# Out of State                                                                 #
-# ============================================================================ #
-visual.print_df(df[["out_of_state"]].describe().T)
-oot = df[['out_of_state', 'out_of_state_compliance_pct']].drop_duplicates()
-oot.columns = ['Out_of_State', 'Compliance_Pct']
-sns.set(style="whitegrid")
-sns.barplot(x="Out_of_State", y="Compliance_Pct", data=oot).set_title("In vs Out State Compliance Percent")
+INDICATOR = [
+    ('out_of_town', 'Out_of_Town', "In vs Out of Town Compliance Percent"),
+    ('out_of_state', 'Out_of_State', "In vs Out State Compliance Percent"),
+    ('ticket_issued_month', 'Ticket_Issued_Month', "Compliance by Month Ticket Issued")]
 
 #%%
 # ============================================================================ #
-# Region                                                                       #
+# Judgment Amount, Payment Window and Daily Payment                            #
 # ============================================================================ #
-visual.print_df(df[["region"]].describe().T)
-region = df[['region', 'region_compliance_pct']].drop_duplicates()
-region.columns = ['Region', 'Compliance_Pct']
-sns.set(style="whitegrid")
-sns.distplot(region.Compliance_Pct, kde=False).set_title("Compliance Percent Frequency Spectrum by Region")
+VIOLIN = [
+    ('judgment_amount', "Compliance by Judgment Amount"),
+    ('log_judgment_amount', "Compliance by Log Judgment Amount"),
+    ('payment_window', "Compliance by Payment Window"),
+    ('daily_payment', "Compliance by Daily Payment"),
+    ('log_daily_payment', "Compliance by Log Daily Payment")]
 
 #%%
 # ============================================================================ #
-# Violation Code                                                               #
+#                                    MAIN                                      #
 # ============================================================================ #
-visual.print_df(df[["violation_code"]].describe().T)
-violation_code = df[['violation_code', 'violation_code_compliance_pct']].drop_duplicates()
-violation_code.columns = ['violation_code', 'Compliance_Pct']
-sns.set(style="whitegrid")
-sns.distplot(violation_code.Compliance_Pct, kde=False).set_title("Compliance Percent Frequency Spectrum by Violation Code")
+def main(file_name = "train.csv"):
+    df = read(file_name)
+    print(df.info())
 
-#%%
-# ============================================================================ #
-# Judgment Amount                                                              #
-# ============================================================================ #
-visual.print_df(df[["judgment_amount"]].describe().T)
-sns.set(style="whitegrid")
-sns.violinplot(x='compliance_label', y='judgment_amount', data=df).set_title("Compliance by Judgment Amount")
+    summary = compliance(df)
+    visual.print_df(summary)
+    visual.bar_plot(summary, "Compliance", "Counts", "Complance Summary")
+    visual.show()
 
-#%%
-# ============================================================================ #
-# Log Judgment Amount                                                              #
-# ============================================================================ #
-visual.print_df(df[["log_judgment_amount"]].describe().T)
-sns.set(style="whitegrid")
-sns.violinplot(x='compliance_label', y='log_judgment_amount', data=df).set_title("Compliance by Log Judgment Amount")
+    visual.print_df(df[["agency_name"]].describe().T)
+    visual.bar_plot(agency(df), "Compliance_Pct", "Agency_Name", "Agency Compliance Percent")
+    visual.show()
 
-#%%
-# ============================================================================ #
-# Payment Window                                                               #
-# ============================================================================ #
-visual.print_df(df[["payment_window"]].describe().T)
-sns.set(style="whitegrid")
-sns.violinplot(x='compliance_label', y='payment_window', data=df).set_title("Compliance by Payment Window")
+    for var, pct_var, label, title in SPECTRUM:
+        visual.print_df(df[[var]].describe().T)
+        visual.freq_dist(spectrum(df, var, pct_var, label).Compliance_Pct, title)
+        visual.show()
 
-#%%
-# ============================================================================ #
-# Log Payment Window                                                               #
-# ============================================================================ #
-visual.print_df(df[["log_payment_window"]].describe().T)
-sns.set(style="whitegrid")
-sns.violinplot(x='compliance_label', y='log_payment_window', data=df).set_title("Compliance by Log Payment Window")
+    visual.print_df(df[["state_compliance_pct"]].describe().T)
+    visual.freq_dist(df.state_compliance_pct, "Compliance Percent Frequency Spectrum by State")
+    visual.show()
 
-#%%
-# ============================================================================ #
-# Daily payment                                                                #
-# ============================================================================ #
-visual.print_df(df[["daily_payment"]].describe().T)
-sns.set(style="whitegrid")
-sns.violinplot(x='compliance_label', y='daily_payment', data=df).set_title("Compliance by Daily Payment")
+    for var, label, title in INDICATOR:
+        visual.print_df(df[[var]].describe().T)
+        visual.bar_plot(indicator(df, var, label), label, "Compliance_Pct", title)
+        visual.show()
 
-#%%
-# ============================================================================ #
-# Log Daily Payment                                                            #
-# ============================================================================ #
-visual.print_df(df[["log_daily_payment"]].describe().T)
-sns.set(style="whitegrid")
-sns.violinplot(x='compliance_label', y='log_daily_payment', data=df).set_title("Compliance by Log Daily Payment")
+    for var, title in VIOLIN:
+        visual.print_df(df[[var]].describe().T)
+        visual.violin_plot(df, 'compliance_label', var, title)
+        visual.show()
 
-#%%
-# ============================================================================ #
-# Ticket Issued Month                                                            #
-# ============================================================================ #
-visual.print_df(df[["ticket_issued_month"]].describe().T)
-sns.set(style="whitegrid")
-sns.barplot(x='compliance_label', y='ticket_issued_month', data=df).set_title("Compliance by Month Ticket Issued")
\ No newline at end of file
+if __name__ == "__main__":
+    import sys
+    main(*sys.argv[1:2])
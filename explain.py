@@ -0,0 +1,186 @@
+#%%
+# ============================================================================ #
+#                                 LIBRARIES                                    #
+# ============================================================================ #
+import multiprocessing as mp
+import pickle
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+#%%
+# ============================================================================ #
+#                               FEATURE FAMILIES                               #
+#    Related features engineered in data.preprocess are permuted together so   #
+#    that importance is not split across near-duplicate columns.               #
+# ============================================================================ #
+FAMILIES = {
+    'agency': ['agency_tickets', 'agency_compliance', 'agency_compliance_pct'],
+    'inspector': ['inspector_tickets', 'inspector_compliance', 'inspector_compliance_pct'],
+    'violator': ['violator_tickets', 'violator_compliance', 'violator_compliance_pct'],
+    'violation': ['violation_tickets', 'violation_compliance', 'violation_compliance_pct'],
+    'violation_street': ['violation_street_tickets', 'violation_street_compliance',
+                         'violation_street_compliance_pct'],
+    'state': ['state_tickets', 'state_compliance', 'state_compliance_pct'],
+    'region': ['region_tickets', 'region_compliance', 'region_compliance_pct'],
+    'location': ['lat', 'lon', 'x', 'y', 'z'],
+    'judgment': ['judgment_amount', 'log_judgment_amount'],
+    'payment': ['payment_window', 'daily_payment', 'log_daily_payment'],
+    'dates': ['ticket_issued_week', 'hearing_week']}
+
+def groups(features, families = FAMILIES):
+    # Maps each family to the column positions of its members in features.
+    # Features that belong to no family form a group of their own. Family
+    # keys are prefixed so a column named like a family, such as region,
+    # cannot replace that family's group.
+    index = {f: i for i, f in enumerate(features)}
+    grouped = {}
+    for name, members in families.items():
+        cols = [index[m] for m in members if m in index]
+        if cols:
+            grouped['family:' + name] = cols
+    seen = set(c for cols in grouped.values() for c in cols)
+    for f, i in index.items():
+        if i not in seen:
+            grouped[f] = [i]
+    return(grouped)
+
+#%%
+# ============================================================================ #
+#                                   SCORING                                    #
+# ============================================================================ #
+def predict(model, X, batch_size = 10000):
+    # Scores rows in batches so every tree is traversed over a contiguous
+    # block of rows while peak memory stays bounded by the batch size.
+    scores = np.empty(X.shape[0])
+    for start in range(0, X.shape[0], batch_size):
+        stop = start + batch_size
+        scores[start:stop] = model.predict_proba(X[start:stop])[:, 1]
+    return(scores)
+
+def auc(y, scores):
+    from sklearn.metrics import roc_auc_score
+    return(roc_auc_score(y, scores))
+
+#%%
+# ============================================================================ #
+#                                WORKER STATE                                  #
+#    The feature matrix is placed in shared memory once and each worker        #
+#    attaches to it read-only. Modified rows are built one batch at a time.    #
+# ============================================================================ #
+_worker = {}
+
+def _init(shm_name, shape, dtype, model, y, batch_size):
+    shm = shared_memory.SharedMemory(name = shm_name)
+    _worker['shm'] = shm
+    _worker['X'] = np.ndarray(shape, dtype = dtype, buffer = shm.buf)
+    model = pickle.loads(model)
+    # The pool already uses every core; a forest trained with n_jobs = -1
+    # would otherwise start its own threads in each worker.
+    if hasattr(model, 'n_jobs'):
+        model.n_jobs = 1
+    _worker['model'] = model
+    _worker['y'] = y
+    _worker['batch_size'] = batch_size
+
+def _predict(modify):
+    # Scores the shared matrix after modify(batch, start) has edited a copy
+    # of each batch of rows beginning at row start.
+    X, batch_size = _worker['X'], _worker['batch_size']
+    scores = np.empty(X.shape[0])
+    for start in range(0, X.shape[0], batch_size):
+        stop = start + batch_size
+        batch = X[start:stop].copy()
+        modify(batch, start)
+        scores[start:stop] = _worker['model'].predict_proba(batch)[:, 1]
+    return(scores)
+
+def _permutation(task):
+    name, cols, seed = task
+    X = _worker['X']
+    perm = np.random.RandomState(seed).permutation(X.shape[0])
+    # The same row permutation is applied to every column in the group so
+    # that the joint distribution within a feature family is preserved.
+    def modify(batch, start):
+        batch[:, cols] = X[np.ix_(perm[start:start + batch.shape[0]], cols)]
+    return(name, auc(_worker['y'], _predict(modify)))
+
+def _dependence(task):
+    name, col, grid = task
+    averages = []
+    for value in grid:
+        def modify(batch, start):
+            batch[:, col] = value
+        averages.append(_predict(modify).mean())
+    return(name, averages)
+
+def _run(func, tasks, model, X, y, processes, batch_size):
+    X = np.ascontiguousarray(X, dtype = np.float64)
+    shm = shared_memory.SharedMemory(create = True, size = max(X.nbytes, 1))
+    try:
+        np.ndarray(X.shape, dtype = X.dtype, buffer = shm.buf)[:] = X
+        initargs = (shm.name, X.shape, X.dtype, pickle.dumps(model), y, batch_size)
+        with mp.Pool(processes, initializer = _init, initargs = initargs) as pool:
+            results = pool.map(func, tasks, chunksize = 1)
+    finally:
+        shm.close()
+        shm.unlink()
+    return(results)
+
+#%%
+# ============================================================================ #
+#                           PERMUTATION IMPORTANCE                             #
+# ============================================================================ #
+def permutation_importance(model, df, features, target = 'compliance',
+                           families = None, repeats = 5, processes = None,
+                           batch_size = 10000, random_state = 0):
+    '''
+    Computes the drop in validation AUC when each feature, or each feature
+    family when families is given, is randomly permuted. Permutations are
+    scored in a process pool against a shared-memory feature matrix.
+    '''
+    features = list(features)
+    X = df[features].values
+    y = df[target].values
+    baseline = auc(y, predict(model, X, batch_size))
+
+    grouped = groups(features, families) if families is not None \
+        else {f: [i] for i, f in enumerate(features)}
+    seeds = np.random.RandomState(random_state).randint(0, 2**31 - 1,
+                                                        size = repeats)
+    tasks = [(name, cols, seed) for name, cols in grouped.items()
+             for seed in seeds]
+    results = _run(_permutation, tasks, model, X, y, processes, batch_size)
+
+    scores = pd.DataFrame(results, columns = ['feature', 'score'])
+    scores['importance'] = baseline - scores['score']
+    importance = scores.groupby('feature')['importance'].agg(['mean', 'std'])
+    importance.columns = ['importance_mean', 'importance_std']
+    importance['features'] = [', '.join(features[c] for c in grouped[name])
+                              for name in importance.index]
+    return(importance.sort_values('importance_mean', ascending = False))
+
+#%%
+# ============================================================================ #
+#                             PARTIAL DEPENDENCE                               #
+# ============================================================================ #
+def partial_dependence(model, df, features, variables = None, grid_size = 20,
+                       processes = None, batch_size = 10000):
+    '''
+    Computes the average predicted probability of compliance over a grid of
+    quantiles for each variable, holding the remaining features at their
+    observed values. Each variable is evaluated by a separate worker.
+    '''
+    features = list(features)
+    X = df[features].values
+    variables = features if variables is None else variables
+    quantiles = np.linspace(0, 1, grid_size)
+    tasks = [(v, features.index(v), np.unique(np.nanquantile(df[v].values, quantiles)))
+             for v in variables]
+    results = _run(_dependence, tasks, model, X, None, processes, batch_size)
+
+    grids = {name: grid for name, _, grid in tasks}
+    pdp = [pd.DataFrame({'feature': name, 'value': grids[name],
+                         'average_prediction': averages})
+           for name, averages in results]
+    return(pd.concat(pdp, ignore_index = True))
@@ -0,0 +1,205 @@
+#%%
+# ============================================================================ #
+#                                 LIBRARIES                                    #
+# ============================================================================ #
+import json
+import os
+import numpy as np
+import pandas as pd
+import data
+import settings
+
+#%%
+# ============================================================================ #
+#                                  SETTINGS                                    #
+# ============================================================================ #
+BASELINE_FILE = "baseline.json"
+
+# Population stability index thresholds: below WARN is stable, above ALERT
+# indicates a significant shift in the feature distribution.
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+
+# Minimum number of non-null values per bin a feature needs before its PSI
+# is computed. With k bins, sampling noise alone gives a PSI of roughly
+# (k - 1) / n, so n must be large relative to k to stay clear of PSI_WARN.
+# Null values are caught by the missing value checks instead.
+PSI_MIN_PER_BIN = 50
+
+# Absolute increase over the training rate at which a data quality check,
+# such as the share of missing values, raises an alert, and the number of
+# tickets needed before rates are compared.
+RATE_TOLERANCE = 0.05
+RATE_MIN_SAMPLE = 1000
+
+FEATURES = ['judgment_amount', 'lat', 'lon']
+
+# Categorical features are tracked by the share of their most frequent
+# training levels, with every other level counted in a single bucket.
+CATEGORIES = ['agency_name', 'violation_code', 'inspector_name', 'state']
+MAX_LEVELS = 50
+
+#%%
+# ============================================================================ #
+#                                   CHECKS                                     #
+#    The data quality problems identified in ida.py, expressed as row masks.   #
+# ============================================================================ #
+def checks(df):
+    tid = pd.to_datetime(df['ticket_issued_date'], errors = 'coerce')
+    hd = pd.to_datetime(df['hearing_date'], errors = 'coerce')
+    masks = {
+        'hearing_before_ticket': (hd <= tid).values,
+        'zero_judgment_amount': (df['judgment_amount'] == 0).values}
+    for var in df.columns:
+        masks['missing_' + var] = df[var].isnull().values
+    return(masks)
+
+#%%
+# ============================================================================ #
+#                                  BASELINE                                    #
+#    Bin edges are taken from training quantiles so that each bin holds an     #
+#    equal share of the training data. Batches are summarized by their counts  #
+#    in these bins, which serve as both the PSI input and a quantile sketch.   #
+#    Categorical features are summarized by their counts per training level.   #
+# ============================================================================ #
+def baseline(df, features = FEATURES, categories = CATEGORIES, bins = 20,
+             max_levels = MAX_LEVELS):
+    stats = {'observations': int(df.shape[0]), 'features': {},
+             'categories': {}, 'rates': {}}
+    for var in features:
+        values = df[var].dropna().values.astype(float)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+        if len(edges) < 2:
+            edges = np.repeat(edges, 2)
+        counts = _counts(values, edges)
+        stats['features'][var] = {'edges': edges.tolist(),
+                                  'counts': counts.tolist()}
+    for var in categories:
+        values = df[var].dropna().astype(str)
+        levels = values.value_counts().index[:max_levels].tolist()
+        counts = _level_counts(values, levels)
+        stats['categories'][var] = {'levels': levels,
+                                    'counts': counts.tolist()}
+    for name, mask in checks(df).items():
+        stats['rates'][name] = float(mask.mean())
+    return(stats)
+
+def save_baseline(stats, file_name = BASELINE_FILE):
+    with open(os.path.join(settings.PROCESSED_DATA_DIR, file_name), 'w') as f:
+        json.dump(stats, f)
+
+def load_baseline(file_name = BASELINE_FILE):
+    with open(os.path.join(settings.PROCESSED_DATA_DIR, file_name)) as f:
+        return(json.load(f))
+
+def build_baseline(file_name = "train.csv"):
+    # Summarizes the labeled training tickets and saves them as the baseline.
+    stats = baseline(data.select(data.read(file_name)))
+    save_baseline(stats)
+    return(stats)
+
+def _counts(values, edges):
+    # Only interior edges are used so the outer bins extend to infinity and
+    # values outside the training range are counted rather than dropped.
+    idx = np.searchsorted(edges[1:-1], values, side = 'right')
+    return(np.bincount(idx, minlength = len(edges) - 1))
+
+def _level_counts(values, levels):
+    # Levels not seen among the training levels share the final bucket.
+    codes = pd.Index(levels).get_indexer(values).astype(np.int64)
+    codes[codes < 0] = len(levels)
+    return(np.bincount(codes, minlength = len(levels) + 1))
+
+#%%
+# ============================================================================ #
+#                                 STATISTICS                                   #
+# ============================================================================ #
+def psi(expected, actual, eps = 1e-4, min_per_bin = PSI_MIN_PER_BIN):
+    # Returns NaN when actual holds too few observations to compare.
+    if np.sum(actual) < max(min_per_bin * len(expected), 1):
+        return(np.nan)
+    e = np.maximum(np.asarray(expected, float) / max(np.sum(expected), 1), eps)
+    a = np.maximum(np.asarray(actual, float) / max(np.sum(actual), 1), eps)
+    return(float(np.sum((a - e) * np.log(a / e))))
+
+def quantiles(counts, edges, probs = (0.05, 0.25, 0.5, 0.75, 0.95)):
+    # Approximates quantiles by linear interpolation within the bin that
+    # contains each requested cumulative probability.
+    counts = np.asarray(counts, float)
+    edges = np.asarray(edges, float)
+    total = counts.sum()
+    if total == 0:
+        return({p: np.nan for p in probs})
+    cum = np.concatenate([[0], np.cumsum(counts)]) / total
+    return({p: float(np.interp(p, cum, edges)) for p in probs})
+
+#%%
+# ============================================================================ #
+#                                  MONITOR                                     #
+# ============================================================================ #
+class Monitor:
+    '''
+    Accumulates bin counts and check rates over incoming ticket batches and
+    compares them against the training baseline. Memory is bounded by the
+    number of bins and checks, independent of the number of rows seen.
+    '''
+    def __init__(self, stats = None):
+        self.stats = load_baseline() if stats is None else stats
+        self.observations = 0
+        self.expected = {var: f['counts'] for group in ('features', 'categories')
+                         for var, f in self.stats[group].items()}
+        self.counts = {var: np.zeros(len(counts), dtype = np.int64)
+                       for var, counts in self.expected.items()}
+        self.flagged = {name: 0 for name in self.stats['rates']}
+
+    def update(self, df):
+        # Folds one batch into the running totals and returns the alerts on
+        # those totals. Single scoring batches are usually too small for a
+        # stable PSI, so alerts wait until enough tickets have been seen.
+        self.observations += df.shape[0]
+        for var, f in self.stats['features'].items():
+            values = df[var].dropna().values.astype(float)
+            self.counts[var] += _counts(values, np.asarray(f['edges']))
+        for var, f in self.stats['categories'].items():
+            self.counts[var] += _level_counts(df[var].dropna().astype(str),
+                                              f['levels'])
+        for name, mask in checks(df).items():
+            if name in self.flagged:
+                self.flagged[name] += int(mask.sum())
+        return(self.alerts())
+
+    def report(self):
+        # Summarizes every batch seen so far against the baseline.
+        rows = []
+        for var, expected in self.expected.items():
+            row = {'feature': var, 'psi': psi(expected, self.counts[var])}
+            if var in self.stats['features']:
+                # Outer bins are clamped to the training minimum and maximum.
+                edges = self.stats['features'][var]['edges']
+                for p, q in quantiles(self.counts[var], edges).items():
+                    row['q%02d' % int(p * 100)] = q
+            rows.append(row)
+        return(pd.DataFrame(rows).set_index('feature'))
+
+    def alerts(self):
+        alerts = []
+        for var, expected in self.expected.items():
+            value = psi(expected, self.counts[var])
+            if np.isnan(value):
+                continue
+            if value >= PSI_ALERT:
+                alerts.append(('psi', var, value, 'alert'))
+            elif value >= PSI_WARN:
+                alerts.append(('psi', var, value, 'warn'))
+        if self.observations >= RATE_MIN_SAMPLE:
+            for name, n in self.flagged.items():
+                rate = n / self.observations
+                if rate > self.stats['rates'][name] + RATE_TOLERANCE:
+                    alerts.append(('rate', name, rate, 'alert'))
+        return(pd.DataFrame(alerts, columns = ['check', 'name', 'value', 'level']))
+
+#%%
+# =============================================================================
+if __name__ == "__main__":
+    import sys
+    build_baseline(*sys.argv[1:2])
@@ -0,0 +1,228 @@
+#%%
+# ============================================================================ #
+#                                 LIBRARIES                                    #
+# ============================================================================ #
+import glob
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import pickle
+import numpy as np
+import pandas as pd
+import data
+import explain
+import settings
+
+#%%
+# ============================================================================ #
+#                                 PARTITIONS                                   #
+#    Tickets are split into contiguous ticket_id ranges holding roughly equal  #
+#    numbers of tickets. The plan is saved with the output so that a resumed   #
+#    run reuses the same boundaries and skips partitions already written.      #
+# ============================================================================ #
+PLAN_FILE = "plan.json"
+MANIFEST_FILE = "manifest.json"
+
+def partitions(ticket_ids, n):
+    # Each range starts one past the end of the previous one, so every id
+    # between the smallest and largest ticket_id falls in exactly one range.
+    ids = np.unique(ticket_ids)
+    bounds = [b for b in np.array_split(ids, min(n, len(ids))) if len(b)]
+    ranges = []
+    for i, b in enumerate(bounds):
+        lo = int(b[0]) if i == 0 else ranges[-1][1] + 1
+        ranges.append((lo, int(b[-1])))
+    return(ranges)
+
+def plan(out_dir, ticket_ids, n):
+    file_name = os.path.join(out_dir, PLAN_FILE)
+    if os.path.exists(file_name):
+        with open(file_name) as f:
+            return([tuple(p) for p in json.load(f)])
+    ranges = partitions(ticket_ids, n)
+    with open(file_name, 'w') as f:
+        json.dump(ranges, f)
+    return(ranges)
+
+def part_file(out_dir, lo, hi):
+    return(os.path.join(out_dir, "part-%d-%d.parquet" % (lo, hi)))
+
+def uncovered(ticket_ids, ranges):
+    # Returns the ticket_ids that fall in none of the planned ranges.
+    ids = np.asarray(ticket_ids)
+    covered = np.zeros(len(ids), dtype = bool)
+    for lo, hi in ranges:
+        covered |= (ids >= lo) & (ids <= hi)
+    return(ids[~covered])
+
+#%%
+# ============================================================================ #
+#                                  MANIFEST                                    #
+#    Records what a run's partitions were scored from. Saved partitions are    #
+#    reused only when the model, features, input and id span all match.        #
+# ============================================================================ #
+def file_hash(file_name):
+    sha = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return(sha.hexdigest())
+
+def manifest(model_file, features, file_name, ticket_ids, median_payment_window):
+    input_file = os.path.join(settings.RAW_DATA_DIR, file_name)
+    return({'model_file': os.path.abspath(model_file),
+            'model_sha256': file_hash(model_file),
+            'features': list(features),
+            'input_file': os.path.abspath(input_file),
+            'input_mtime': os.path.getmtime(input_file),
+            'input_size': os.path.getsize(input_file),
+            'id_span': [int(np.min(ticket_ids)), int(np.max(ticket_ids))],
+            'median_payment_window': float(median_payment_window)})
+
+def prepare(out_dir, run, restart = False):
+    # Clears saved partitions from a different run, or raises unless restart.
+    file_name = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(file_name):
+        with open(file_name) as f:
+            saved = json.load(f)
+        if saved == run:
+            return
+        if not restart:
+            changed = sorted(k for k in run if saved.get(k) != run[k])
+            raise ValueError("%s holds predictions from a different run (%s "
+                "changed); pass restart = True or choose another out_dir"
+                % (out_dir, ', '.join(changed)))
+    for stale in glob.glob(os.path.join(out_dir, "part-*.parquet")) + \
+                 [os.path.join(out_dir, PLAN_FILE)]:
+        if os.path.exists(stale):
+            os.remove(stale)
+    with open(file_name, 'w') as f:
+        json.dump(run, f)
+
+#%%
+# ============================================================================ #
+#                                   WORKER                                     #
+# ============================================================================ #
+_worker = {}
+
+def _init(model_file, features, median_payment_window, batch_size):
+    with open(model_file, 'rb') as f:
+        _worker['model'] = pickle.load(f)
+    _worker['features'] = features
+    _worker['median_payment_window'] = median_payment_window
+    _worker['batch_size'] = batch_size
+
+def _score(task):
+    lo, hi, df, file_name = task
+    X = data.transform(df, _worker['median_payment_window'])
+    features = X[_worker['features']].values.astype(float)
+    # Rows with missing or infinite features, such as tickets without
+    # coordinates, are left unscored rather than failing the partition.
+    finite = np.isfinite(features).all(axis = 1)
+    compliance = np.full(X.shape[0], np.nan)
+    compliance[finite] = explain.predict(_worker['model'], features[finite],
+                                         _worker['batch_size'])
+    predictions = pd.DataFrame({'ticket_id': X['ticket_id'].values,
+                                'compliance': compliance})
+    # Write to a temporary file and rename so that an interrupted worker
+    # never leaves a partial partition that would be taken as complete.
+    tmp = file_name + ".tmp"
+    predictions.to_parquet(tmp, index = False)
+    os.replace(tmp, file_name)
+    return(lo, hi, predictions.shape[0], int((~finite).sum()))
+
+#%%
+# ============================================================================ #
+#                                   SCORE                                      #
+# ============================================================================ #
+def score(model_file, file_name = "test.csv", out_dir = None, features = None,
+          n_partitions = 64, processes = None, batch_size = 10000,
+          median_payment_window = None, restart = False, monitor = None):
+    '''
+    Scores the tickets in file_name with the pickled model, one ticket_id
+    partition per task in a process pool. Each completed partition is
+    written to its own parquet file, so rerunning the same model on the same
+    input only scores the partitions that are missing. Missing hearing dates
+    are imputed with the training median payment window. Tickets dropped
+    by the address join, or with non-finite features, are counted and left
+    unscored. When a monitor.Monitor is given, each partition is folded
+    into it as it is dispatched and its alerts are returned with the output
+    directory.
+    '''
+    out_dir = os.path.join(settings.PREDICTIONS_DIR,
+        os.path.splitext(file_name)[0]) if out_dir is None else out_dir
+    os.makedirs(out_dir, exist_ok = True)
+
+    if features is None:
+        with open(model_file, 'rb') as f:
+            model = pickle.load(f)
+        if not hasattr(model, 'feature_names_in_'):
+            raise ValueError("%s was not fitted on a DataFrame and records no "
+                             "feature names; pass features" % model_file)
+        features = list(model.feature_names_in_)
+    if median_payment_window is None:
+        median_payment_window = data.median_window(
+            data.select(data.read("train.csv")))
+
+    df = data.read(file_name)
+    df = df[['ticket_id']].join(data.select(df, train = False))
+
+    # data.read drops tickets without a matching address or coordinates.
+    raw = pd.read_csv(os.path.join(settings.RAW_DATA_DIR, file_name),
+                      encoding = "Latin-1", usecols = ['ticket_id'])
+    unmatched = raw.shape[0] - df.shape[0]
+    if unmatched:
+        print("%d of %d tickets have no address or coordinates and are not "
+              "scored" % (unmatched, raw.shape[0]))
+
+    # Only transform features can be rebuilt for unlabeled tickets, so check
+    # the model's features here rather than failing inside a worker.
+    columns = data.transform(df.head(100).copy(), median_payment_window).columns
+    missing = [f for f in features if f not in columns]
+    if missing:
+        raise ValueError("Features not available at scoring time: %s"
+                         % ', '.join(missing))
+
+    run = manifest(model_file, features, file_name, df['ticket_id'].values,
+                   median_payment_window)
+    prepare(out_dir, run, restart)
+    ranges = plan(out_dir, df['ticket_id'].values, n_partitions)
+    outside = uncovered(df['ticket_id'].values, ranges)
+    if len(outside):
+        print("%d tickets fall outside the planned ranges and are not scored"
+              % len(outside))
+    pending = [(lo, hi) for lo, hi in ranges
+               if not os.path.exists(part_file(out_dir, lo, hi))]
+    print("%d of %d partitions to score" % (len(pending), len(ranges)))
+
+    def tasks():
+        for lo, hi in pending:
+            part = df[df['ticket_id'].between(lo, hi)]
+            if monitor is not None:
+                monitor.update(part)
+            yield(lo, hi, part, part_file(out_dir, lo, hi))
+
+    initargs = (model_file, features, median_payment_window, batch_size)
+    with mp.Pool(processes, initializer = _init, initargs = initargs) as pool:
+        for lo, hi, rows, unscored in pool.imap_unordered(_score, tasks()):
+            print("Scored tickets %d to %d: %d rows, %d unscored for "
+                  "missing or infinite features" % (lo, hi, rows, unscored))
+    if monitor is not None:
+        alerts = monitor.alerts()
+        print(alerts.to_string(index = False) if len(alerts) else "No drift alerts")
+        return(out_dir, alerts)
+    return(out_dir)
+
+def collect(out_dir):
+    # Combines the partition files of a completed run into one DataFrame.
+    with open(os.path.join(out_dir, PLAN_FILE)) as f:
+        ranges = json.load(f)
+    return(pd.concat([pd.read_parquet(part_file(out_dir, lo, hi))
+                      for lo, hi in ranges], ignore_index = True))
+
+#%%
+# =============================================================================
+if __name__ == "__main__":
+    import sys
+    score(*sys.argv[1:3])
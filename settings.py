@@ -1,2 +1,3 @@
 RAW_DATA_DIR = "./data/raw"
-PROCESSED_DATA_DIR = "./data/processed"
\ No newline at end of file
+PROCESSED_DATA_DIR = "./data/processed"
+PREDICTIONS_DIR = "./data/predictions"
\ No newline at end of file
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+import data
+
+
+def test_transform_corrects_hearing_dates_on_or_before_ticket_date():
+    df = pd.DataFrame({
+        'ticket_issued_date': ['2012-01-10'] * 5,
+        'hearing_date': ['2012-01-09', '2012-01-05', '2012-01-10', None, '2012-02-10'],
+        'judgment_amount': [305.0] * 5,
+        'lat': [42.3] * 5,
+        'lon': [-83.0] * 5})
+    out = data.transform(df, median_payment_window = 30.0).sort_index()
+    assert out['payment_window'].tolist() == [30.0, 30.0, 30.0, 30.0, 31.0]
+    assert np.isfinite(out[['daily_payment', 'log_daily_payment']].values).all()
+
+
+def test_transform_uses_given_median_payment_window():
+    df = pd.DataFrame({
+        'ticket_issued_date': ['2012-01-10', '2012-01-10'],
+        'hearing_date': ['2012-01-20', None],
+        'judgment_amount': [100.0, 100.0],
+        'lat': [42.3, 42.3],
+        'lon': [-83.0, -83.0]})
+    out = data.transform(df, median_payment_window = 45.0).sort_index()
+    assert out['payment_window'].tolist() == [10.0, 45.0]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import monitor
+import settings
+
+
+def tickets(n, seed = 0, judgment_scale = 1.0):
+    rng = np.random.RandomState(seed)
+    issued = pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.randint(0, 1500, n), 'D')
+    hearing = issued + pd.to_timedelta(rng.randint(-5, 120, n), 'D')
+    return(pd.DataFrame({
+        'ticket_issued_date': issued.astype(str),
+        'hearing_date': hearing.astype(str),
+        'judgment_amount': np.round(rng.lognormal(5, 1, n) * judgment_scale, 2),
+        'lat': rng.normal(42.39, 0.04, n),
+        'lon': rng.normal(-83.11, 0.1, n),
+        'agency_name': rng.choice(['Buildings', 'Public Works', 'Police'], n,
+                                  p = [0.6, 0.35, 0.05]),
+        'violation_code': rng.choice(['v%d' % i for i in range(120)], n,
+                                     p = np.arange(120, 0, -1) / 7260.0),
+        'inspector_name': rng.choice(['i%d' % i for i in range(150)], n),
+        'state': rng.choice(['MI', 'CA', 'TX', 'IL'], n, p = [0.9, 0.04, 0.03, 0.03])}))
+
+
+@pytest.fixture
+def train():
+    return(tickets(50000))
+
+
+def test_undrifted_batches_raise_no_alerts(train):
+    m = monitor.Monitor(monitor.baseline(train))
+    for seed in range(1, 51):
+        sample = train.sample(200, random_state = seed)
+        assert m.update(sample).empty
+
+
+def test_empty_batch_raises_no_alerts(train):
+    m = monitor.Monitor(monitor.baseline(train))
+    assert m.update(train.iloc[:0]).empty
+
+
+def test_baseline_round_trip_and_shifted_batch(train, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'PROCESSED_DATA_DIR', str(tmp_path))
+    stats = monitor.baseline(train)
+    monitor.save_baseline(stats)
+    assert monitor.load_baseline() == stats
+
+    m = monitor.Monitor()
+    alerts = m.update(tickets(5000, seed = 1, judgment_scale = 3.0))
+    shifted = alerts[(alerts['check'] == 'psi') & (alerts['level'] == 'alert')]
+    assert shifted['name'].tolist() == ['judgment_amount']
@@ -0,0 +1,111 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+import data
+import score
+import settings
+
+FEATURES = ['judgment_amount', 'payment_window', 'log_daily_payment', 'x', 'y', 'z']
+
+
+def raw_tickets(ids, rng):
+    n = len(ids)
+    issued = pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.randint(0, 900, n), 'D')
+    hearing = issued + pd.to_timedelta(rng.randint(-5, 90, n), 'D')
+    return(pd.DataFrame({
+        'ticket_id': ids,
+        'agency_name': 'Buildings',
+        'inspector_name': 'Inspector',
+        'violator_name': 'Violator',
+        'violation_street_number': 1,
+        'violation_street_name': 'MAIN',
+        'city': 'DETROIT',
+        'state': 'MI',
+        'zip_code': '48201',
+        'country': 'USA',
+        'ticket_issued_date': issued.astype(str),
+        'hearing_date': hearing.astype(str),
+        'violation_code': 'v1',
+        'judgment_amount': rng.lognormal(5, 1, n).round(2)}))
+
+
+@pytest.fixture
+def raw(tmp_path, monkeypatch):
+    rng = np.random.RandomState(0)
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    train = raw_tickets(np.arange(1, 501), rng)
+    train['compliance'] = rng.randint(0, 2, len(train))
+    test = raw_tickets(np.arange(1001, 1301), rng)
+    ids = np.concatenate([train['ticket_id'], test['ticket_id']])
+    # The last test ticket has no address and the one before no coordinates.
+    addresses = pd.DataFrame({'ticket_id': ids[:-1],
+                              'address': ['a%d' % i for i in ids[:-1]]})
+    latlons = pd.DataFrame({'address': addresses['address'],
+                            'lat': rng.normal(42.39, 0.04, len(addresses)),
+                            'lon': rng.normal(-83.11, 0.1, len(addresses))})
+    latlons.loc[latlons.index[-1], 'lat'] = np.nan
+    for name, frame in [('train.csv', train), ('test.csv', test),
+                        ('addresses.csv', addresses), ('latlons.csv', latlons)]:
+        frame.to_csv(str(raw_dir / name), index = False)
+    monkeypatch.setattr(settings, 'RAW_DATA_DIR', str(raw_dir))
+    monkeypatch.setattr(settings, 'PREDICTIONS_DIR', str(tmp_path / 'predictions'))
+
+    X = data.transform(data.select(data.read('train.csv')))
+    model = RandomForestClassifier(n_estimators = 10, random_state = 0)
+    model.fit(X[FEATURES], X['compliance'])
+    model_file = str(tmp_path / 'model.pkl')
+    with open(model_file, 'wb') as f:
+        pickle.dump(model, f)
+    return(model_file)
+
+
+def test_score_resumes_and_leaves_non_finite_rows_unscored(raw, capsys):
+    out_dir = score.score(raw, n_partitions = 4, processes = 2)
+    predictions = score.collect(out_dir)
+    assert sorted(predictions['ticket_id']) == list(range(1001, 1300))
+    assert predictions['compliance'].isnull().sum() == 1
+    assert "1 of 300 tickets have no address" in capsys.readouterr().out
+
+    score.score(raw, n_partitions = 4, processes = 2)
+    assert "0 of 4 partitions to score" in capsys.readouterr().out
+
+
+def test_score_rejects_saved_partitions_from_another_model(raw, tmp_path):
+    score.score(raw, n_partitions = 4, processes = 2)
+    with open(raw, 'rb') as f:
+        model = pickle.load(f)
+    model.set_params(n_estimators = 5)
+    model.estimators_ = model.estimators_[:5]
+    refreshed = str(tmp_path / 'refreshed.pkl')
+    with open(refreshed, 'wb') as f:
+        pickle.dump(model, f)
+    with pytest.raises(ValueError, match = 'model'):
+        score.score(refreshed, n_partitions = 4, processes = 2)
+    score.score(refreshed, n_partitions = 4, processes = 2, restart = True)
+
+
+def test_score_requires_features_for_models_without_names(raw, tmp_path):
+    model = RandomForestClassifier(n_estimators = 2).fit(np.zeros((4, 6)), [0, 1, 0, 1])
+    model_file = str(tmp_path / 'array_model.pkl')
+    with open(model_file, 'wb') as f:
+        pickle.dump(model, f)
+    with pytest.raises(ValueError, match = 'pass features'):
+        score.score(model_file)
+
+
+def test_score_names_features_unavailable_at_scoring_time(raw):
+    with pytest.raises(ValueError, match = 'agency_compliance_pct'):
+        score.score(raw, features = FEATURES + ['agency_compliance_pct'])
+
+
+def test_score_updates_monitor_with_each_partition(raw):
+    import monitor
+    m = monitor.Monitor(monitor.baseline(data.select(data.read('train.csv'))))
+    out_dir, alerts = score.score(raw, n_partitions = 4, processes = 2, monitor = m)
+    assert m.observations == 299
+    assert list(alerts.columns) == ['check', 'name', 'value', 'level']
@@ -1,32 +1,51 @@
+_plt = None
+
+def _pyplot():
+    # Imports seaborn and matplotlib on first use and applies the plot style
+    # once, so importing this module does not load the plotting stack.
+    global _plt
+    if _plt is None:
+        import seaborn as sns
+        import matplotlib.pyplot as plt
+        sns.set(style="whitegrid", font_scale=2)
+        _plt = plt
+    return(_plt)
+
 def print_df(df):
     # This function pretty prints a pandas dataframe
     import tabulate
     print(tabulate.tabulate(df, headers='keys', tablefmt='psql'))
 
+def show():
+    # Renders all open figures, fitting long axis labels within each figure
+    plt = _pyplot()
+    for num in plt.get_fignums():
+        plt.figure(num).tight_layout()
+    plt.show()
+
 def freq_dist(counts, title):
     import seaborn as sns
-    import matplotlib.pyplot as plt
-    sns.set(style="whitegrid", font_scale=2)
-    fig, ax = plt.subplots()
+    fig, ax = _pyplot().subplots()
     fd_plot = sns.distplot(counts, bins=40, ax=ax, kde=False,
-    color='steelblue').set_title(title)    
+    color='steelblue').set_title(title)
     return(fd_plot)
 
 def bar_plot(df, xval, yval, title):
     import seaborn as sns
-    import matplotlib.pyplot as plt
-    sns.set(style="whitegrid", font_scale=2)
-    fig, ax = plt.subplots()
-    bp = sns.barplot(x=xval, y=yval, data=df, ax=ax, 
-        color='steelblue').set_title(title)    
+    fig, ax = _pyplot().subplots()
+    bp = sns.barplot(x=xval, y=yval, data=df, ax=ax,
+        color='steelblue').set_title(title)
     return(bp)
 
 def histogram(values, title):
     import seaborn as sns
-    import matplotlib.pyplot as plt
-    sns.set(style="whitegrid", font_scale=2)
-    fig, ax = plt.subplots()
+    fig, ax = _pyplot().subplots()
     hist = sns.distplot(values,bins=40, ax=ax, kde=False,
-    color='steelblue').set_title(title)    
+    color='steelblue').set_title(title)
     return(hist)
 
+def violin_plot(df, xval, yval, title):
+    import seaborn as sns
+    fig, ax = _pyplot().subplots()
+    vp = sns.violinplot(x=xval, y=yval, data=df, ax=ax).set_title(title)
+    return(vp)